@@ -1,14 +1,17 @@
 import logging
 import re
+import threading
 import time
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
-import html2text
 import requests
-from bs4 import BeautifulSoup, Tag
+from cachetools import TTLCache, cachedmethod
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +24,26 @@ DEFAULT_HEADERS = {
     )
 }
 
+# Tags rendered on their own line when flattening an HTML block to text
+_BLOCK_TAGS = frozenset(
+    ("p", "div", "ul", "ol", "blockquote", "pre", "table", "tr",
+     "h1", "h2", "h3", "h4", "h5", "h6")
+)
+_SKIPPED_TAGS = frozenset(("script", "style", "noscript", "img"))
+_WHITESPACE_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Only these tags (and their subtrees) are kept when parsing event pages;
+# scripts, styles and other top-level chrome are skipped entirely
+_PAGE_STRAINER = SoupStrainer(["meta", "div", "section", "article", "img"])
+# (attribute, value) pairs of the meta tags read from event pages
+_WANTED_META = frozenset(
+    (
+        ("property", "og:description"),
+        ("name", "description"),
+        ("property", "og:image"),
+    )
+)
+
 
 @dataclass(frozen=True)
 class EventDetails:
@@ -37,14 +60,36 @@ class EventDescriptionScraper:
         self,
         base_url: str,
         timeout: float = 20.0,
-        request_delay: float = 0.25,
+        request_delay: float = 0.0,
+        max_in_flight: int = 8,
         session: Optional[requests.Session] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
+        self._base_slash = f"{self.base_url}/"
         self.timeout = timeout
         self.request_delay = max(0.0, request_delay)
+        # Politeness is shared across threads: cap concurrent requests and,
+        # if request_delay is set, space request starts at least that far apart
+        self._in_flight = threading.BoundedSemaphore(max(1, max_in_flight))
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._details_cache: TTLCache = TTLCache(maxsize=2048, ttl=3600)
+        self._details_cache_lock = threading.Lock()
         self.session = session or requests.Session()
         self.session.headers.update(DEFAULT_HEADERS)
+        # All pages live on one host, so a single large pool keeps
+        # connections alive across the scraping threads
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def get_details(self, url_path: str) -> EventDetails:
         """Public entry point: resolve url_path, fetch HTML, extract details."""
@@ -62,49 +107,61 @@ class EventDescriptionScraper:
             return ""
         if url_path.startswith(("http://", "https://")):
             return url_path
-        return urljoin(f"{self.base_url}/", url_path.lstrip("/"))
+        return _join(self._base_slash, url_path.lstrip("/"))
 
-    @lru_cache(maxsize=512)
+    @cachedmethod(
+        lambda self: self._details_cache,
+        lock=lambda self: self._details_cache_lock,
+    )
     def _cached_fetch(self, full_url: str) -> EventDetails:
         try:
-            response = self.session.get(full_url, timeout=self.timeout)
+            with self._in_flight:
+                self._wait_for_turn()
+                response = self.session.get(full_url, timeout=self.timeout)
             response.raise_for_status()
-            return self._extract_details(response.text)
+            # Let the parser detect the encoding from the raw bytes rather than
+            # having requests guess it for response.text
+            return self._extract_details(response.content)
         except requests.RequestException as exc:
             logger.warning("Failed to fetch description from %s: %s", full_url, exc)
             return EventDetails()
-        finally:
-            if self.request_delay:
-                time.sleep(self.request_delay)
 
-    def _extract_details(self, html: str) -> EventDetails:
-        soup = BeautifulSoup(html, "html.parser")
+    def _wait_for_turn(self) -> None:
+        if not self.request_delay:
+            return
+        with self._rate_lock:
+            wait = self._next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request_at = time.monotonic() + self.request_delay
+
+    def _extract_details(self, html: Union[str, bytes]) -> EventDetails:
+        soup = BeautifulSoup(html, "lxml", parse_only=_PAGE_STRAINER)
+        meta = _collect_meta(soup)
 
         post_body = soup.select_one('[data-layout-label="Post Body"]')
+        # One walk collects both the text blocks and the button links
+        content_blocks, button_anchors = _scan_blocks(post_body or soup)
         description = ""
         if post_body:
             fragments = []
-            for block in post_body.select(".sqs-block.html-block .sqs-block-content"):
-                # Convert each block's HTML to text using html2text
-                block_html = str(block)
-                rendered = _html_to_text(block_html)
+            for block in content_blocks:
+                # Render the already-parsed block instead of re-parsing its HTML
+                rendered = _block_to_text(block)
                 if rendered:
                     fragments.append(rendered)
             if fragments:
                 description = _cleanup_text("\n\n".join(fragments))
 
         if not description:
-            for meta_name in (
-                ("property", "og:description"),
-                ("name", "description"),
-            ):
-                meta_tag = soup.find("meta", attrs={meta_name[0]: meta_name[1]})
-                if meta_tag and meta_tag.get("content"):
-                    description = meta_tag["content"].strip()
-                    break
-
-        external_url, external_label = self._extract_external_link(post_body or soup)
-        poster_image_url = self._extract_poster_image(soup)
+            description = (
+                meta.get(("property", "og:description"))
+                or meta.get(("name", "description"))
+                or ""
+            )
+
+        external_url, external_label = self._extract_external_link(button_anchors)
+        poster_image_url = self._extract_poster_image(soup, meta)
 
         return EventDetails(
             description=description,
@@ -113,7 +170,7 @@ class EventDescriptionScraper:
             poster_image_url=poster_image_url,
         )
 
-    def _extract_external_link(self, scope: Tag) -> Tuple[str, str]:
+    def _extract_external_link(self, button_anchors: List[Tag]) -> Tuple[str, str]:
         """Look for a button-styled external link (official site/RSVP).
         
         Only matches links inside Squarespace button blocks, not inline links
@@ -121,7 +178,7 @@ class EventDescriptionScraper:
         """
         # Only look for actual button elements - these appear as standalone
         # rectangular outlined buttons on the page
-        for anchor in scope.select(".sqs-block-button a"):
+        for anchor in button_anchors:
                 href = (anchor.get("href") or "").strip()
                 normalized = self._normalize_href(href)
                 if not normalized:
@@ -138,14 +195,16 @@ class EventDescriptionScraper:
     def _normalize_href(self, href: str) -> str:
         if not href:
             return ""
-        return urljoin(f"{self.base_url}/", href)
+        return _join(self._base_slash, href)
 
-    def _extract_poster_image(self, soup: BeautifulSoup) -> str:
+    def _extract_poster_image(
+        self, soup: BeautifulSoup, meta: Dict[Tuple[str, str], str]
+    ) -> str:
         """Extract the main poster/banner image URL from the event page."""
         # Try og:image meta tag first (most reliable for main event image)
-        og_image = soup.find("meta", attrs={"property": "og:image"})
-        if og_image and og_image.get("content"):
-            return og_image["content"].strip()
+        og_image = meta.get(("property", "og:image"))
+        if og_image:
+            return og_image
 
         # Fallback: look for main banner image in the page structure
         # Squarespace often uses this for event banner images
@@ -158,25 +217,105 @@ class EventDescriptionScraper:
         return ""
 
 
-def _create_html2text_converter() -> html2text.HTML2Text:
-    """Create a configured html2text converter."""
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-    h.ignore_images = True
-    h.ignore_emphasis = True
-    h.body_width = 0  # Don't wrap lines
-    h.ul_item_mark = "-"  # Use dash for bullet points
-    h.single_line_break = True  # Use single newlines instead of double
-    return h
+@lru_cache(maxsize=4096)
+def _join(base: str, href: str) -> str:
+    """Memoized urljoin; every call shares the same base URL."""
+    return urljoin(base, href)
+
+
+def _collect_meta(soup: BeautifulSoup) -> Dict[Tuple[str, str], str]:
+    """Collect the wanted meta tag contents in a single pass over the page."""
+    found: Dict[Tuple[str, str], str] = {}
+    for tag in soup.find_all("meta"):
+        content = (tag.get("content") or "").strip()
+        if not content:
+            continue
+        for attr in ("property", "name"):
+            key = (attr, tag.get(attr))
+            if key in _WANTED_META:
+                found.setdefault(key, content)
+    return found
+
+
+def _scan_blocks(scope: Tag) -> Tuple[List[Tag], List[Tag]]:
+    """Collect html-block contents and button-block anchors in one walk.
+
+    Equivalent to selecting ``.sqs-block.html-block .sqs-block-content`` and
+    ``.sqs-block-button a`` within scope, in document order.
+    """
+    content_blocks: List[Tag] = []
+    button_anchors: List[Tag] = []
+    _collect_blocks(scope, False, False, content_blocks, button_anchors)
+    return content_blocks, button_anchors
+
+
+def _collect_blocks(
+    node: Tag,
+    in_html_block: bool,
+    in_button: bool,
+    content_blocks: List[Tag],
+    button_anchors: List[Tag],
+) -> None:
+    for child in node.children:
+        if not isinstance(child, Tag):
+            continue
+        classes = child.get("class") or ()
+        if in_html_block and "sqs-block-content" in classes:
+            # The whole block is rendered, so nothing below it is needed
+            content_blocks.append(child)
+            continue
+        if in_button and child.name == "a":
+            button_anchors.append(child)
+        _collect_blocks(
+            child,
+            in_html_block or ("sqs-block" in classes and "html-block" in classes),
+            in_button or "sqs-block-button" in classes,
+            content_blocks,
+            button_anchors,
+        )
 
 
-def _html_to_text(html: str) -> str:
-    """Convert HTML to readable plaintext using html2text."""
-    if not html:
-        return ""
-    converter = _create_html2text_converter()
-    text = converter.handle(html)
-    return _cleanup_text(text)
+def _block_to_text(block: Tag) -> str:
+    """Flatten a parsed HTML block to plaintext, keeping line breaks, bullets and links."""
+    parts: List[str] = []
+    _render_children(block, parts)
+    # One line per block, matching html2text's single_line_break output
+    lines = (line.strip() for line in "".join(parts).split("\n"))
+    return _cleanup_text("\n".join(line for line in lines if line))
+
+
+def _render_children(node: Tag, parts: List[str]) -> None:
+    for child in node.children:
+        if isinstance(child, NavigableString):
+            # Skip comments, CDATA and other non-text strings
+            if type(child) is NavigableString:
+                parts.append(_WHITESPACE_RE.sub(" ", child))
+            continue
+
+        name = child.name
+        if name in _SKIPPED_TAGS:
+            continue
+        if name == "br":
+            parts.append("\n")
+        elif name == "li":
+            parts.append("\n- ")
+            _render_children(child, parts)
+            parts.append("\n")
+        elif name == "a":
+            link_parts: List[str] = []
+            _render_children(child, link_parts)
+            text = "".join(link_parts).strip()
+            href = (child.get("href") or "").strip()
+            if href and href != text:
+                parts.append(f"{text} ({href})" if text else href)
+            else:
+                parts.append(text)
+        elif name in _BLOCK_TAGS:
+            parts.append("\n")
+            _render_children(child, parts)
+            parts.append("\n")
+        else:
+            _render_children(child, parts)
 
 
 def _cleanup_text(value: str) -> str:
@@ -186,7 +325,7 @@ def _cleanup_text(value: str) -> str:
     # Normalize Windows/Mac line endings
     value = value.replace("\r\n", "\n").replace("\r", "\n")
     # Reduce 3+ blank lines to 2
-    value = re.sub(r"\n{3,}", "\n\n", value)
+    value = _BLANK_LINES_RE.sub("\n\n", value)
     return value.strip()
 
 
@@ -2,20 +2,26 @@
 NYC for Free Calendar Sync - Simple functional version
 """
 
-import json
+import hashlib
 import logging
 import os
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-import pytz
+import orjson
 import requests
 from dotenv import load_dotenv
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from description_scraper import EventDescriptionScraper
+from description_scraper import DEFAULT_HEADERS, EventDescriptionScraper, EventDetails
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,94 +38,220 @@ GOOGLE_CALENDAR_ID = os.environ["GOOGLE_CALENDAR_ID"]
 NYC_COLLECTION_ID = os.getenv("NYC_COLLECTION_ID", "63de598a71ebc00f98284aaf")
 NYC_CRUMB = os.getenv("NYC_CRUMB")
 MONTHS_AHEAD = int(os.getenv("NYC_MONTHS_AHEAD", "4"))
+# Optional path where the calendar listing and its sync token are kept between runs
+SYNC_STATE_FILE = os.getenv("NYC_SYNC_STATE_FILE")
+# Optional directory for caching raw API month payloads (handy for re-runs)
+CACHE_DIR = os.getenv("NYC_CACHE_DIR")
+CACHE_TTL = int(os.getenv("NYC_CACHE_TTL", "3600"))
 
 NYC_BASE_URL = "https://www.nycforfree.co"
 NYC_API_URL = f"{NYC_BASE_URL}/api/open/GetItemsByMonth"
+# Query parameters shared by every month request
+API_BASE_PARAMS = {"collectionId": NYC_COLLECTION_ID}
+if NYC_CRUMB:
+    API_BASE_PARAMS["crumb"] = NYC_CRUMB
 TIMEZONE = "America/New_York"
-# IMPORT_MARKER = "Imported from nycforfree.co"
+_TZ = ZoneInfo(TIMEZONE)
 INSERT_DELAY = 0.01
+BATCH_SIZE = 50  # Google API limit per batch request
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0  # Seconds before the first retry, doubled each time
+SCRAPE_WORKERS = 16
 SCRAPED_DESCRIPTION_FIELD = "_scraped_description"
 OFFICIAL_URL_FIELD = "_official_url"
 OFFICIAL_LABEL_FIELD = "_official_label"
 POSTER_IMAGE_FIELD = "_poster_image_url"
+# Private extended properties linking calendar events to NYC for Free items
+SOURCE_PROPERTY = "nyc4free_source"
+SOURCE_VALUE = "nycforfree"
+SOURCE_ID_PROPERTY = "nyc4free_id"
+CONTENT_HASH_PROPERTY = "nyc4free_hash"
+ADDRESS_KEYS = ("addressTitle", "addressLine1", "addressLine2", "addressCountry")
+# Only fetch what we need when listing calendar events
+LIST_FIELDS = "items(id,status,end,extendedProperties/private),nextPageToken,nextSyncToken"
+
+
+def create_api_session() -> requests.Session:
+    """Create a keep-alive session for the NYC for Free API."""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers["Accept"] = "application/json"
+    adapter = HTTPAdapter(
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_API_SESSION = create_api_session()
 
 
 def get_calendar_service():
     """Create Google Calendar API service."""
-    creds_dict = json.loads(GOOGLE_SERVICE_ACCOUNT_JSON)
+    creds_dict = orjson.loads(GOOGLE_SERVICE_ACCOUNT_JSON)
     creds = service_account.Credentials.from_service_account_info(
         creds_dict,
         scopes=["https://www.googleapis.com/auth/calendar"],
     )
-    return build("calendar", "v3", credentials=creds)
+    # Use the discovery document bundled with googleapiclient instead of
+    # fetching it over HTTP on every run
+    return build(
+        "calendar",
+        "v3",
+        credentials=creds,
+        static_discovery=True,
+        cache_discovery=False,
+    )
+
+
+def month_cache_path(month_str: str) -> str:
+    """Path of the cached payload for a month of this collection."""
+    key = hashlib.sha1(f"{month_str}-{NYC_COLLECTION_ID}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def read_cached_month(month_str: str) -> Optional[bytes]:
+    """Return a cached month payload younger than CACHE_TTL, if caching is enabled."""
+    if not CACHE_DIR:
+        return None
+    path = month_cache_path(month_str)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+    logger.info(f"Using cached events for {month_str}")
+    return content
+
+
+def write_cached_month(month_str: str, content: bytes) -> None:
+    """Store a month payload if caching is enabled."""
+    if not CACHE_DIR:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write aside and rename, so a crash never leaves a truncated payload
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+            f.write(content)
+        os.replace(f.name, month_cache_path(month_str))
+    except OSError as e:
+        logger.warning(f"Failed to cache events for {month_str}: {e}")
 
 
 def fetch_events_for_month(year: int, month: int) -> List[Dict[str, Any]]:
-    """Fetch events from NYC for Free API for a specific month."""
+    """Fetch events from NYC for Free API for a specific month.
+    
+    Raises requests.RequestException or ValueError when the month cannot be
+    fetched, so a failure is never mistaken for a month without events.
+    """
     month_str = f"{month:02d}-{year}"
-    params = {
-        "month": month_str,
-        "collectionId": NYC_COLLECTION_ID,
-    }
-    if NYC_CRUMB:
-        params["crumb"] = NYC_CRUMB
+    params = {"month": month_str, **API_BASE_PARAMS}
 
     logger.info(f"Fetching events for {month_str}")
     
-    try:
-        response = requests.get(NYC_API_URL, params=params, timeout=20)
-        response.raise_for_status()
-        data = response.json()
-        
+    cached = read_cached_month(month_str)
+    if cached is not None:
+        try:
+            data = orjson.loads(cached)
+        except orjson.JSONDecodeError:
+            data = None
         if isinstance(data, list):
             return data
-        
-        logger.warning(f"Unexpected response format for {month_str}")
-        return []
-        
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch {month_str}: {e}")
-        return []
+        logger.warning(f"Ignoring unreadable cached events for {month_str}")
+    
+    response = _API_SESSION.get(NYC_API_URL, params=params, timeout=20)
+    response.raise_for_status()
+    content = response.content
+    data = orjson.loads(content)
+    
+    if not isinstance(data, list):
+        raise ValueError(f"Unexpected response format for {month_str}")
+    
+    write_cached_month(month_str, content)
+    return data
+
 
+def fallback_event_key(event: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    """Dedupe key for events without an ID, built from a few stable fields."""
+    return (event.get("urlId"), event.get("startDate"), event.get("title"))
 
-def fetch_all_events() -> List[Dict[str, Any]]:
-    """Fetch events for current month + MONTHS_AHEAD, deduplicated by ID."""
+
+def iter_unique_events(
+    month_results: Iterable[List[Dict[str, Any]]]
+) -> Iterator[Dict[str, Any]]:
+    """Yield each event once across all months, keeping the first occurrence."""
+    seen_keys = set()
+    duplicates = 0
+    missing_ids = 0
+    
+    for month_events in month_results:
+        for event in month_events:
+            event_key = event.get("id")
+            if not event_key:
+                missing_ids += 1
+                event_key = fallback_event_key(event)
+            
+            if event_key in seen_keys:
+                duplicates += 1
+                continue
+            seen_keys.add(event_key)
+            yield event
+    
+    if missing_ids:
+        logger.warning(f"{missing_ids} events have no ID, deduplicated by URL, start date and title")
+    if duplicates:
+        logger.info(f"Dropped {duplicates} duplicate events")
+
+
+def fetch_all_events() -> Tuple[List[Dict[str, Any]], bool]:
+    """Fetch events for current month + MONTHS_AHEAD, deduplicated by ID.
+    
+    Months that fail are logged and skipped; the second value is False when
+    any month failed, so callers know the events are incomplete.
+    """
     today = date.today()
-    all_events = []
+    month_pairs = []
     
-    # Fetch events for each month
     for i in range(MONTHS_AHEAD + 1):
-        year = today.year
-        month = today.month + i
-        
         # Handle year rollover
-        while month > 12:
-            month -= 12
-            year += 1
-        
-        all_events.extend(fetch_events_for_month(year, month))
-    
-    # Deduplicate by ID
-    seen_ids = set()
-    unique_events = []
+        years_ahead, month_index = divmod(today.month - 1 + i, 12)
+        month_pairs.append((today.year + years_ahead, month_index + 1))
     
-    for event in all_events:
-        event_id = event.get("id")
-        if not event_id:
-            event_id = json.dumps(event, sort_keys=True)
-        
-        if event_id not in seen_ids:
-            seen_ids.add(event_id)
-            unique_events.append(event)
+    def fetch_month(pair: Tuple[int, int]) -> Optional[List[Dict[str, Any]]]:
+        try:
+            return fetch_events_for_month(*pair)
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Failed to fetch {pair[1]:02d}-{pair[0]}: {e}")
+            return None
+    
+    # Fetch all months concurrently; each request is independent I/O
+    with ThreadPoolExecutor(max_workers=len(month_pairs)) as executor:
+        month_results = list(executor.map(fetch_month, month_pairs))
+    
+    failed = sum(1 for result in month_results if result is None)
+    unique_events = list(
+        iter_unique_events(result for result in month_results if result is not None)
+    )
     
     logger.info(f"Fetched {len(unique_events)} unique events")
-    return unique_events
+    if failed:
+        logger.warning(f"{failed} of {len(month_pairs)} months could not be fetched")
+    return unique_events, not failed
 
 
 def ms_to_datetime(milliseconds: int) -> datetime:
     """Convert milliseconds since epoch to timezone-aware datetime."""
-    tz = pytz.timezone(TIMEZONE)
-    return datetime.fromtimestamp(milliseconds / 1000.0, tz=tz)
+    return datetime.fromtimestamp(milliseconds / 1000.0, tz=_TZ)
 
 
 def is_all_day(start_dt: datetime, end_dt: datetime) -> bool:
@@ -140,13 +272,10 @@ def build_google_event(item: Dict[str, Any]) -> Dict[str, Any]:
     title = item.get("title") or "NYC for FREE event"
     
     # Build location string
+    # Resolve each address field once; the description reuses the lines below
     location_obj = item.get("location") or {}
-    location_parts = []
-    for key in ("addressTitle", "addressLine1", "addressLine2", "addressCountry"):
-        value = location_obj.get(key, "")
-        if value:
-            location_parts.append(str(value).strip())
-    location = ", ".join(location_parts)
+    address = {key: str(location_obj.get(key) or "").strip() for key in ADDRESS_KEYS}
+    location = ", ".join(value for value in address.values() if value)
     
     # Get start/end timestamps
     structured = item.get("structuredContent") or {}
@@ -179,162 +308,439 @@ def build_google_event(item: Dict[str, Any]) -> Dict[str, Any]:
         end_field = {"dateTime": end_dt.isoformat(), "timeZone": TIMEZONE}
     
     # Build description
-    scraped_description = item.get(SCRAPED_DESCRIPTION_FIELD, "").strip()
-    excerpt = item.get("excerpt", "").strip()
+    scraped_description = (item.get(SCRAPED_DESCRIPTION_FIELD) or "").strip()
+    excerpt = (item.get("excerpt") or "").strip()
     tags = item.get("tags") or []
     author = item.get("author") or {}
     
-    author_name = author.get("displayName", "").strip()
+    author_name = (author.get("displayName") or "").strip()
     
-    full_url = item.get("fullUrl", "")
+    full_url = item.get("fullUrl") or ""
     source_url = f"{NYC_BASE_URL.rstrip('/')}{full_url}" if full_url else ""
     
-    official_url = item.get(OFFICIAL_URL_FIELD, "").strip()
-    official_label = item.get(OFFICIAL_LABEL_FIELD, "").strip() or "Official Link"
-    poster_image_url = item.get(POSTER_IMAGE_FIELD, "").strip()
-    address_line1 = location_obj.get("addressLine1", "").strip()
-    address_line2 = location_obj.get("addressLine2", "").strip()
-    
-    description_parts = []
+    official_url = (item.get(OFFICIAL_URL_FIELD) or "").strip()
+    official_label = (item.get(OFFICIAL_LABEL_FIELD) or "").strip() or "Official Link"
+    poster_image_url = (item.get(POSTER_IMAGE_FIELD) or "").strip()
+    address_line1 = address["addressLine1"]
+    address_line2 = address["addressLine2"]
     
-    if source_url:
-        if poster_image_url:
-            description_parts.append(f"Full Information (has poster): {source_url}")
-        else:
-            description_parts.append(f"Full Information: {source_url}")
-        description_parts.append("\n")
     details_text = scraped_description or excerpt
     
-    # if poster_image_url:
-    #     # description_parts.append(f"(has poster image)")
-    #     # description_parts.append(f"\nPoster: {poster_image_url}")
-    #     description_parts.append("\n")
-    
-    if address_line1 or address_line2:
-        description_parts.append("\nLocation:")
-        if address_line1:
-            description_parts.append(f"\n{address_line1}")
-        if address_line2:
-            description_parts.append(f"\n{address_line2}")
-        
-        description_parts.append("\n")
-    
-    if details_text:
-        description_parts.append("\nAbout:\n")
-        description_parts.append(details_text)
-        description_parts.append("\n")
-        
-    if official_url:
-        description_parts.append(f"\n{official_label}: {official_url}")
-        description_parts.append("\n")
-    
-    if details_text:
-        description_parts.append("\n---")
-    
-    if tags:
-        description_parts.append(f"\nTags: {', '.join(str(t) for t in tags)}")
-    if author_name:
-        description_parts.append(f"\nListed by: {author_name}")
-    
-    # description_parts.append(f"\n\nRaw item JSON:\n{json.dumps(item, indent=2)}")
-
-    description = "".join(description_parts)
+    # Assemble each section once, then join them in a single f-string
+    source_block = ""
+    if source_url:
+        poster_note = " (has poster)" if poster_image_url else ""
+        source_block = f"Full Information{poster_note}: {source_url}\n"
+    
+    location_lines = "".join(f"\n{line}" for line in (address_line1, address_line2) if line)
+    location_block = f"\nLocation:{location_lines}\n" if location_lines else ""
+    about_block = f"\nAbout:\n{details_text}\n" if details_text else ""
+    official_block = f"\n{official_label}: {official_url}\n" if official_url else ""
+    separator = "\n---" if details_text else ""
+    tags_block = f"\nTags: {', '.join(str(t) for t in tags)}" if tags else ""
+    author_block = f"\nListed by: {author_name}" if author_name else ""
+    
+    description = (
+        f"{source_block}{location_block}{about_block}{official_block}"
+        f"{separator}{tags_block}{author_block}"
+    )
     
-    return {
+    event = {
         "summary": title,
         "location": location,
         "start": start_field,
         "end": end_field,
         "description": description,
     }
+    
+    private = {
+        SOURCE_PROPERTY: SOURCE_VALUE,
+        CONTENT_HASH_PROPERTY: event_content_hash(event),
+    }
+    if item.get("id"):
+        private[SOURCE_ID_PROPERTY] = str(item["id"])
+    event["extendedProperties"] = {"private": private}
+    
+    return event
+
 
+def event_content_hash(event: Dict[str, Any]) -> str:
+    """Hash the user-visible fields of a Google Calendar event body."""
+    content = {key: value for key, value in event.items() if key != "extendedProperties"}
+    return hashlib.sha1(orjson.dumps(content, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
-def delete_future_events(service, calendar_id: str) -> int:
-    """Delete events from current month onwards using batch requests for speed."""
-    deleted = 0
+
+def sync_key(event: Dict[str, Any]) -> str:
+    """Key matching a built event to its copy on the calendar.
+    
+    Uses the NYC for Free item ID, falling back to the content hash for
+    items without one.
+    """
+    private = (event.get("extendedProperties") or {}).get("private") or {}
+    source_id = private.get(SOURCE_ID_PROPERTY)
+    if source_id:
+        return source_id
+    return f"hash:{private.get(CONTENT_HASH_PROPERTY, '')}"
+
+
+def list_calendar_events(
+    service, calendar_id: str, **params
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Page through events.list, returning the items and the final sync token."""
+    items = []
     page_token = None
     
-    # Calculate start of current month
-    tz = pytz.timezone(TIMEZONE)
-    today = datetime.now(tz)
-    start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    time_min = start_of_month.isoformat()
-    
-    logger.info(f"Deleting events from {start_of_month.strftime('%Y-%m-%d')} onwards...")
-    
-    # First, collect all event IDs
-    event_ids = []
     while True:
+        # No singleEvents: a recurring series comes back as one master event,
+        # and deleting it removes every instance
+        result = service.events().list(
+            calendarId=calendar_id,
+            pageToken=page_token,
+            maxResults=2500,
+            fields=LIST_FIELDS,
+            **params,
+        ).execute()
+        
+        items.extend(result.get("items", []))
+        
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return items, result.get("nextSyncToken")
+
+
+def load_sync_state(path: str) -> Dict[str, Any]:
+    """Load the stored calendar listing, or an empty state if unavailable."""
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable sync state {path}: {e}")
+        return {}
+
+
+def save_sync_state(path: str, state: Dict[str, Any]) -> None:
+    """Write the calendar listing and sync token for the next run."""
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(state))
+
+
+def list_events_incrementally(
+    service, calendar_id: str, state_path: str
+) -> List[Dict[str, Any]]:
+    """List all calendar events, fetching only changes since the stored sync token.
+    
+    Falls back to a full listing when there is no token or Google has
+    expired it (HTTP 410).
+    """
+    state = load_sync_state(state_path)
+    events = state.get("events") or {}
+    sync_token = state.get("syncToken")
+    changes = None
+    
+    if sync_token:
         try:
-            result = service.events().list(
-                calendarId=calendar_id,
-                singleEvents=True,
-                pageToken=page_token,
-                maxResults=2500,
-                timeMin=time_min,  # Only events from current month onwards
-                fields="items(id),nextPageToken",  # Only fetch what we need
-            ).execute()
-            
-            event_ids.extend(event["id"] for event in result.get("items", []))
-            
-            page_token = result.get("nextPageToken")
-            if not page_token:
-                break
-                
-        except Exception as e:
-            logger.error(f"Error listing events: {e}")
-            raise
+            changes, sync_token = list_calendar_events(service, calendar_id, syncToken=sync_token)
+            logger.info(f"Fetched {len(changes)} calendar changes since last run")
+        except HttpError as e:
+            if e.resp.status != 410:
+                raise
+            logger.info("Sync token expired, listing all events")
+    
+    if changes is None:
+        events = {}
+        changes, sync_token = list_calendar_events(service, calendar_id)
+    
+    for item in changes:
+        if item.get("status") == "cancelled":
+            events.pop(item["id"], None)
+        else:
+            events[item["id"]] = item
     
-    if not event_ids:
-        logger.info("No events to delete")
-        return 0
+    save_sync_state(state_path, {"syncToken": sync_token, "events": events})
+    return list(events.values())
+
+
+def event_ends_after(event: Dict[str, Any], moment: datetime) -> bool:
+    """Check whether an event ends after moment, matching events.list's timeMin."""
+    end = event.get("end") or {}
+    if end.get("dateTime"):
+        return datetime.fromisoformat(end["dateTime"].replace("Z", "+00:00")) > moment
+    if end.get("date"):
+        # All-day end dates are exclusive and fall at local midnight
+        end_date = date.fromisoformat(end["date"])
+        return datetime(end_date.year, end_date.month, end_date.day, tzinfo=_TZ) > moment
+    return True
+
+
+def is_imported_event(event: Dict[str, Any]) -> bool:
+    """Check whether a calendar event was created by this sync."""
+    private = (event.get("extendedProperties") or {}).get("private") or {}
+    return private.get(SOURCE_PROPERTY) == SOURCE_VALUE
+
+
+def list_existing_events(service, calendar_id: str) -> Dict[str, Dict[str, str]]:
+    """List imported events from current month onwards, keyed by sync key.
+    
+    Extra copies of an already-seen key get a key no built event can match,
+    so the sync deletes them. Untagged events are left alone, except on the
+    first run after upgrading: while no tagged events exist in the window,
+    every event in it is listed (and so deleted) as a leftover of an older
+    version of this script, which replaced the whole window on every run.
+    """
+    # Calculate start of current month
+    today = datetime.now(_TZ)
+    start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
-    logger.info(f"Found {len(event_ids)} events to delete, batching requests...")
+    logger.info(f"Listing events from {start_of_month.strftime('%Y-%m-%d')} onwards...")
     
-    # Delete in batches of 50 (Google API limit)
-    BATCH_SIZE = 50
+    try:
+        if SYNC_STATE_FILE:
+            # Sync tokens cannot be combined with timeMin or property filters,
+            # so both are applied locally
+            items = [
+                item
+                for item in list_events_incrementally(service, calendar_id, SYNC_STATE_FILE)
+                if event_ends_after(item, start_of_month)
+            ]
+            items = [item for item in items if is_imported_event(item)] or items
+        else:
+            time_min = start_of_month.isoformat()
+            items, _ = list_calendar_events(
+                service,
+                calendar_id,
+                timeMin=time_min,
+                privateExtendedProperty=f"{SOURCE_PROPERTY}={SOURCE_VALUE}",
+            )
+            if not items:
+                # Nothing tagged yet: list everything so events created by
+                # older versions of this script get replaced
+                items, _ = list_calendar_events(service, calendar_id, timeMin=time_min)
+    except Exception as e:
+        logger.error(f"Error listing events: {e}")
+        raise
+    
+    existing = {}
+    for item in items:
+        private = (item.get("extendedProperties") or {}).get("private") or {}
+        key = sync_key(item) if CONTENT_HASH_PROPERTY in private else None
+        if key is None or key in existing:
+            key = f"event:{item['id']}"
+        existing[key] = {
+            "id": item["id"],
+            "hash": private.get(CONTENT_HASH_PROPERTY, ""),
+        }
+    
+    logger.info(f"Found {len(existing)} existing events")
+    return existing
+
+
+def is_rate_limited(exception: Exception) -> bool:
+    """Check whether a Google API error is a quota/rate-limit rejection."""
+    if not isinstance(exception, HttpError):
+        return False
+    if exception.resp.status == 429:
+        return True
+    if exception.resp.status != 403:
+        return False
+    details = exception.error_details if isinstance(exception.error_details, list) else []
+    return any(
+        isinstance(detail, dict)
+        and detail.get("reason") in ("rateLimitExceeded", "userRateLimitExceeded")
+        for detail in details
+    )
+
+
+def retry_after_seconds(exception: HttpError) -> float:
+    """Read the Retry-After header from a rate-limit error, or 0 if absent."""
+    try:
+        return max(0.0, float(exception.resp.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def execute_batched(service, calls: List[Tuple[str, Any]], action: str) -> int:
+    """Run (label, request) pairs through batch requests, returning the success count.
+    
+    Sub-requests rejected by rate limiting are retried in a follow-up batch
+    after the server's Retry-After, or an exponential backoff.
+    """
+    succeeded = 0
+    rate_limited = []
+    retry_after = 0.0
+    can_retry = True
+    
+    def on_done(request_id, response, exception):
+        nonlocal succeeded, retry_after
+        index = int(request_id)
+        if exception is None:
+            succeeded += 1
+        elif can_retry and is_rate_limited(exception):
+            rate_limited.append(index)
+            retry_after = max(retry_after, retry_after_seconds(exception))
+        else:
+            logger.warning(f"Failed to {action} '{calls[index][0]}': {exception}")
     
-    for i in range(0, len(event_ids), BATCH_SIZE):
-        batch = service.new_batch_http_request()
-        batch_ids = event_ids[i:i + BATCH_SIZE]
+    # Send in batches of 50 (Google API limit), pausing between batches
+    for i in range(0, len(calls), BATCH_SIZE):
+        pending = list(range(i, min(i + BATCH_SIZE, len(calls))))
+        attempt = 0
         
-        for event_id in batch_ids:
-            batch.add(
-                service.events().delete(calendarId=calendar_id, eventId=event_id)
-            )
+        while pending:
+            can_retry = attempt < RATE_LIMIT_RETRIES
+            rate_limited.clear()
+            retry_after = 0.0
+            
+            batch = service.new_batch_http_request(callback=on_done)
+            for index in pending:
+                batch.add(calls[index][1], request_id=str(index))
+            
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.error(f"Error in batch {action}: {e}")
+                # Continue with next batch even if one fails
+                break
+            
+            pending = list(rate_limited)
+            if pending:
+                delay = retry_after or RATE_LIMIT_BACKOFF * 2 ** attempt
+                logger.info(f"Rate limited on {len(pending)} {action}s, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
         
-        try:
-            batch.execute()
-            deleted += len(batch_ids)
-            logger.info(f"Deleted batch {i // BATCH_SIZE + 1} ({deleted}/{len(event_ids)} events)")
-        except Exception as e:
-            logger.error(f"Error in batch delete: {e}")
-            # Continue with next batch even if one fails
+        logger.info(
+            f"Finished {action} batch {i // BATCH_SIZE + 1} "
+            f"({succeeded}/{len(calls)} events)"
+        )
+        time.sleep(INSERT_DELAY)
     
-    logger.info(f"Deleted {deleted} events")
-    return deleted
+    return succeeded
 
 
 def insert_events(service, calendar_id: str, events: List[Dict[str, Any]]) -> int:
-    """Insert events into calendar with rate limiting."""
-    inserted = 0
-    
+    """Insert events into calendar using batch requests."""
     logger.info(f"Inserting {len(events)} events...")
+    calls = [
+        (event.get("summary"), service.events().insert(calendarId=calendar_id, body=event))
+        for event in events
+    ]
+    inserted = execute_batched(service, calls, "insert")
+    logger.info(f"Inserted {inserted}/{len(events)} events")
+    return inserted
+
+
+def update_events(
+    service, calendar_id: str, updates: List[Tuple[str, Dict[str, Any]]]
+) -> int:
+    """Replace existing events, given as (event ID, new body) pairs."""
+    logger.info(f"Updating {len(updates)} events...")
+    calls = [
+        (
+            event.get("summary"),
+            service.events().update(calendarId=calendar_id, eventId=event_id, body=event),
+        )
+        for event_id, event in updates
+    ]
+    updated = execute_batched(service, calls, "update")
+    logger.info(f"Updated {updated}/{len(updates)} events")
+    return updated
+
+
+def delete_events(service, calendar_id: str, event_ids: List[str]) -> int:
+    """Delete events by ID using batch requests."""
+    logger.info(f"Deleting {len(event_ids)} events...")
+    calls = [
+        (event_id, service.events().delete(calendarId=calendar_id, eventId=event_id))
+        for event_id in event_ids
+    ]
+    deleted = execute_batched(service, calls, "delete")
+    logger.info(f"Deleted {deleted}/{len(event_ids)} events")
+    return deleted
+
+
+def sync_events(
+    service,
+    calendar_id: str,
+    events: List[Dict[str, Any]],
+    existing: Optional[Dict[str, Dict[str, str]]] = None,
+    complete: bool = True,
+) -> Dict[str, int]:
+    """Bring the calendar in line with events, writing only what changed.
+    
+    New events are inserted, changed ones updated in place and events no
+    longer listed deleted, so subscribers never see the calendar emptied.
+    Pass existing (from list_existing_events) to reuse a listing made earlier,
+    and complete=False when events may be missing some (e.g. a month failed
+    to fetch), so nothing is deleted for merely being absent.
+    """
+    if existing is None:
+        existing = list_existing_events(service, calendar_id)
+    
+    to_insert = []
+    to_update = []
+    seen_keys = set()
     
     for event in events:
+        key = sync_key(event)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        
+        current = existing.get(key)
+        if current is None:
+            to_insert.append(event)
+        elif current["hash"] != event_content_hash(event):
+            to_update.append((current["id"], event))
+    
+    to_delete = [info["id"] for key, info in existing.items() if key not in seen_keys]
+    if to_delete and not complete:
+        logger.warning(f"Keeping {len(to_delete)} unlisted events, the fetch was incomplete")
+        to_delete = []
+    unchanged = len(seen_keys) - len(to_insert) - len(to_update)
+    logger.info(
+        f"{len(to_insert)} new, {len(to_update)} changed, "
+        f"{len(to_delete)} removed, {unchanged} unchanged events"
+    )
+    
+    # Write new and changed events before removing stale ones
+    inserted = insert_events(service, calendar_id, to_insert) if to_insert else 0
+    updated = update_events(service, calendar_id, to_update) if to_update else 0
+    deleted = delete_events(service, calendar_id, to_delete) if to_delete else 0
+    
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "deleted": deleted,
+        "unchanged": unchanged,
+    }
+
+
+def scrape_event_details(
+    scraper: EventDescriptionScraper, events: List[Dict[str, Any]]
+) -> None:
+    """Scrape event detail pages in parallel and attach the results to each event."""
+    to_scrape = [event for event in events if event.get("fullUrl")]
+    logger.info(f"Scraping details for {len(to_scrape)} events...")
+
+    def fetch_details(event: Dict[str, Any]) -> EventDetails:
         try:
-            service.events().insert(
-                calendarId=calendar_id,
-                body=event,
-            ).execute()
-            inserted += 1
-            time.sleep(INSERT_DELAY)
-            
+            return scraper.get_details(event["fullUrl"])
         except Exception as e:
-            logger.warning(f"Failed to insert '{event.get('summary')}': {e}")
-    
-    logger.info(f"Inserted {inserted}/{len(events)} events")
-    return inserted
+            logger.warning(f"Failed to scrape details for event {event.get('id')}: {e}")
+            return EventDetails()
+
+    # Scraping is I/O-bound, so threads overlap the network waits
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+        for event, details in zip(to_scrape, executor.map(fetch_details, to_scrape)):
+            if details.description:
+                event[SCRAPED_DESCRIPTION_FIELD] = details.description
+            if details.external_url:
+                event[OFFICIAL_URL_FIELD] = details.external_url
+                event[OFFICIAL_LABEL_FIELD] = details.external_label or "Official Link"
+            if details.poster_image_url:
+                event[POSTER_IMAGE_FIELD] = details.poster_image_url
 
 
 def main():
@@ -344,53 +750,43 @@ def main():
     try:
         # Initialize services
         service = get_calendar_service()
-        scraper = EventDescriptionScraper(base_url=NYC_BASE_URL)
-        
-        # Delete existing events
-        delete_future_events(service, GOOGLE_CALENDAR_ID)
+        scraper = EventDescriptionScraper(
+            base_url=NYC_BASE_URL, max_in_flight=SCRAPE_WORKERS
+        )
         
-        # Fetch events from NYC for Free
-        nyc_events = fetch_all_events()
-        
-        # Process and insert events one at a time
-        logger.info(f"Processing and inserting {len(nyc_events)} events...")
-        inserted = 0
+        # List the calendar in the background; it only talks to Google and
+        # is independent of the NYC for Free fetch below
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            existing_future = executor.submit(
+                list_existing_events, service, GOOGLE_CALENDAR_ID
+            )
+            
+            # Fetch events from NYC for Free
+            nyc_events, complete = fetch_all_events()
+            
+            # Scrape descriptions for all events up front
+            scrape_event_details(scraper, nyc_events)
+            
+            # Convert to Google Calendar format
+            google_events = []
+            for event in nyc_events:
+                try:
+                    google_events.append(build_google_event(event))
+                except Exception as e:
+                    logger.warning(f"Failed to process event {event.get('id')}: {e}")
+            
+            existing = existing_future.result()
         
-        for i, event in enumerate(nyc_events, 1):
-            try:
-                # Scrape description for this event
-                url = event.get("fullUrl")
-                if url:
-                    details = scraper.get_details(url)
-                    if details.description:
-                        event[SCRAPED_DESCRIPTION_FIELD] = details.description
-                    if details.external_url:
-                        event[OFFICIAL_URL_FIELD] = details.external_url
-                        event[OFFICIAL_LABEL_FIELD] = (
-                            details.external_label or "Official Link"
-                        )
-                    if details.poster_image_url:
-                        event[POSTER_IMAGE_FIELD] = details.poster_image_url
-                
-                # Convert to Google Calendar format
-                google_event = build_google_event(event)
-                
-                # Insert immediately
-                service.events().insert(
-                    calendarId=GOOGLE_CALENDAR_ID,
-                    body=google_event,
-                ).execute()
-                inserted += 1
-                
-                if i % 10 == 0:
-                    logger.info(f"Processed {i}/{len(nyc_events)} events")
-                
-                time.sleep(INSERT_DELAY)
-                
-            except Exception as e:
-                logger.warning(f"Failed to process event {event.get('id')}: {e}")
+        # Write only the differences to the calendar
+        counts = sync_events(
+            service, GOOGLE_CALENDAR_ID, google_events, existing, complete=complete
+        )
         
-        logger.info(f"Sync completed successfully. Inserted {inserted}/{len(nyc_events)} events")
+        logger.info(
+            f"Sync completed successfully. Inserted {counts['inserted']}, "
+            f"updated {counts['updated']}, deleted {counts['deleted']}, "
+            f"unchanged {counts['unchanged']} events"
+        )
         return 0
         
     except Exception as e:
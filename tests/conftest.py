@@ -0,0 +1,8 @@
+import os
+import sys
+
+# main.py reads these at import time; the tests never talk to Google
+os.environ.setdefault("GOOGLE_SERVICE_ACCOUNT_JSON", "{}")
+os.environ.setdefault("GOOGLE_CALENDAR_ID", "test-calendar")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
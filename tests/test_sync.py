@@ -0,0 +1,265 @@
+import copy
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+import requests
+
+import main
+
+
+def ends_after(item, moment):
+    end = item["end"]
+    if "dateTime" in end:
+        return datetime.fromisoformat(end["dateTime"]) > moment
+    return datetime.fromisoformat(end["date"]).replace(tzinfo=moment.tzinfo) > moment
+
+
+class StubRequest:
+    def __init__(self, func):
+        self._func = func
+
+    def execute(self):
+        return self._func()
+
+
+class StubBatch:
+    def __init__(self, callback):
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self._requests:
+            try:
+                self._callback(request_id, request.execute(), None)
+            except Exception as e:
+                self._callback(request_id, None, e)
+
+
+class StubEvents:
+    def __init__(self, service):
+        self._service = service
+
+    def list(self, calendarId, pageToken=None, maxResults=None, fields=None,
+             timeMin=None, privateExtendedProperty=None, syncToken=None):
+        def run():
+            service = self._service
+            if syncToken is not None:
+                changed = [
+                    event_id
+                    for event_id, version in service.changed.items()
+                    if version > int(syncToken)
+                ]
+                items = [service.listed(event_id) for event_id in changed]
+            else:
+                items = [service.listed(event_id) for event_id in service.stored]
+                if timeMin:
+                    # Google applies timeMin to the event's end time
+                    moment = datetime.fromisoformat(timeMin)
+                    items = [item for item in items if ends_after(item, moment)]
+                if privateExtendedProperty:
+                    name, value = privateExtendedProperty.split("=", 1)
+                    items = [
+                        item for item in items
+                        if item.get("extendedProperties", {}).get("private", {}).get(name) == value
+                    ]
+            return {"items": items, "nextSyncToken": str(service.version)}
+        return StubRequest(run)
+
+    def insert(self, calendarId, body):
+        def run():
+            event_id = f"event{len(self._service.changed) + 1}"
+            self._service.store(event_id, body)
+            return {"id": event_id}
+        return StubRequest(run)
+
+    def update(self, calendarId, eventId, body):
+        return StubRequest(lambda: self._service.store(eventId, body))
+
+    def delete(self, calendarId, eventId):
+        return StubRequest(lambda: self._service.store(eventId, None))
+
+
+class StubCalendarService:
+    """In-memory stand-in for the parts of the Calendar API the sync uses."""
+
+    def __init__(self):
+        self.stored = {}
+        self.changed = {}
+        self.version = 0
+
+    def store(self, event_id, body):
+        self.version += 1
+        self.changed[event_id] = self.version
+        if body is None:
+            del self.stored[event_id]
+        else:
+            self.stored[event_id] = copy.deepcopy(body)
+        return {}
+
+    def listed(self, event_id):
+        if event_id not in self.stored:
+            return {"id": event_id, "status": "cancelled"}
+        body = self.stored[event_id]
+        return {"id": event_id, "status": "confirmed", **body}
+
+    def events(self):
+        return StubEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return StubBatch(callback)
+
+
+def make_item(item_id, start, end):
+    return {
+        "id": item_id,
+        "title": f"Event {item_id}",
+        "fullUrl": f"/events/{item_id}",
+        "structuredContent": {
+            "startDate": int(start.timestamp() * 1000),
+            "endDate": int(end.timestamp() * 1000),
+        },
+    }
+
+
+@pytest.fixture
+def google_events():
+    now = datetime.now(main._TZ)
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    items = [
+        # Started last month and still running
+        make_item("ongoing", start_of_month - timedelta(days=5, hours=-10),
+                  start_of_month + timedelta(days=10, hours=18)),
+        make_item("upcoming", start_of_month + timedelta(days=40, hours=19),
+                  start_of_month + timedelta(days=40, hours=21)),
+    ]
+    return [main.build_google_event(item) for item in items]
+
+
+@pytest.fixture(autouse=True)
+def no_batch_delay(monkeypatch):
+    monkeypatch.setattr(main, "INSERT_DELAY", 0)
+
+
+@pytest.mark.parametrize("use_state_file", [False, True])
+def test_resync_leaves_unchanged_events_alone(
+    monkeypatch, tmp_path, google_events, use_state_file
+):
+    state_file = str(tmp_path / "state.json") if use_state_file else None
+    monkeypatch.setattr(main, "SYNC_STATE_FILE", state_file)
+    service = StubCalendarService()
+
+    first = main.sync_events(service, "calendar", google_events)
+    assert first["inserted"] == 2
+
+    for _ in range(2):
+        counts = main.sync_events(service, "calendar", google_events)
+        assert counts == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 2}
+    assert len(service.stored) == 2
+
+
+def test_build_google_event_tolerates_null_fields():
+    start = datetime(2024, 6, 1, 18, tzinfo=main._TZ)
+    item = make_item("nulls", start, start + timedelta(hours=2))
+    item.update({
+        "excerpt": None,
+        "fullUrl": None,
+        "author": {"displayName": None},
+        main.SCRAPED_DESCRIPTION_FIELD: None,
+        main.OFFICIAL_URL_FIELD: None,
+        main.OFFICIAL_LABEL_FIELD: None,
+        main.POSTER_IMAGE_FIELD: None,
+    })
+
+    event = main.build_google_event(item)
+    assert event["summary"] == "Event nulls"
+    assert event["description"] == ""
+
+
+class StubResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def test_unreadable_month_cache_is_refetched(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "CACHE_DIR", str(tmp_path))
+    path = main.month_cache_path("06-2024")
+    with open(path, "wb") as f:
+        f.write(b'[{"id": "trunc')
+    fetched = []
+
+    def get(url, params=None, timeout=None):
+        fetched.append(params["month"])
+        return StubResponse(b'[{"id": "a"}]')
+
+    monkeypatch.setattr(main._API_SESSION, "get", get)
+
+    assert main.fetch_events_for_month(2024, 6) == [{"id": "a"}]
+    assert fetched == ["06-2024"]
+    with open(path, "rb") as f:
+        assert f.read() == b'[{"id": "a"}]'
+    assert main.fetch_events_for_month(2024, 6) == [{"id": "a"}]
+    assert fetched == ["06-2024"]
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(path)]
+
+
+def untagged(event):
+    return {key: value for key, value in event.items() if key != "extendedProperties"}
+
+
+@pytest.mark.parametrize("use_state_file", [False, True])
+def test_first_run_replaces_untagged_events(
+    monkeypatch, tmp_path, google_events, use_state_file
+):
+    state_file = str(tmp_path / "state.json") if use_state_file else None
+    monkeypatch.setattr(main, "SYNC_STATE_FILE", state_file)
+    service = StubCalendarService()
+    # Left behind by a version of the script that did not tag its events
+    for event in google_events:
+        service.store(f"old-{event['summary']}", untagged(event))
+
+    counts = main.sync_events(service, "calendar", google_events)
+    assert counts["inserted"] == 2
+    assert counts["deleted"] == 2
+    assert len(service.stored) == 2
+
+    # Once tagged events exist, untagged ones are left alone
+    service.store("manual", untagged(google_events[1]))
+    counts = main.sync_events(service, "calendar", google_events)
+    assert counts == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 2}
+    assert "manual" in service.stored
+
+
+def test_failed_month_is_reported(monkeypatch):
+    def fetch(year, month):
+        if month == date.today().month:
+            raise requests.ConnectionError("API down")
+        return [{"id": f"{year}-{month}"}]
+
+    monkeypatch.setattr(main, "fetch_events_for_month", fetch)
+
+    events, complete = main.fetch_all_events()
+    assert not complete
+    assert len(events) == main.MONTHS_AHEAD
+
+
+def test_incomplete_fetch_deletes_nothing(monkeypatch, google_events):
+    monkeypatch.setattr(main, "SYNC_STATE_FILE", None)
+    service = StubCalendarService()
+    main.sync_events(service, "calendar", google_events)
+    changed = copy.deepcopy(google_events[0])
+    changed["summary"] = "Renamed"
+    changed["extendedProperties"]["private"][main.CONTENT_HASH_PROPERTY] = (
+        main.event_content_hash(changed)
+    )
+
+    # The second event's month failed to fetch
+    counts = main.sync_events(service, "calendar", [changed], complete=False)
+    assert counts == {"inserted": 0, "updated": 1, "deleted": 0, "unchanged": 0}
+    assert len(service.stored) == 2